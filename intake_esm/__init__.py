@@ -9,6 +9,7 @@ import intake
 from intake_esm import tutorial
 from intake_esm.core import esm_datastore
 from intake_esm.derived import DerivedVariableRegistry, default_registry
+from intake_esm.source import clear_open_cache
 from intake_esm.utils import set_options, show_versions
 
 from intake_esm._version import __version__
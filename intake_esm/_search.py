@@ -1,4 +1,5 @@
 import itertools
+import re
 import typing
 
 import numpy as np
@@ -7,26 +8,34 @@ import pandas as pd
 
 def unpack_iterable_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
     """Return a DataFrame where elements of a given iterable column have been unpacked into multiple lines."""
-    rows = []
-    for _, row in df.iterrows():
-        for val in row[column]:
-            new_row = row.copy()
-            new_row[column] = val
-            rows.append(new_row)
-    return pd.DataFrame(rows)
+    # `explode` turns empty iterables into a NaN row, whereas they should produce no rows at all
+    return df[df[column].str.len() > 0].explode(column)
+
+
+# Wildcard characters that are not escaped with a backslash
+_WILDCARD_RE = re.compile(r'(?<!\\)[*?$^]')
 
 
 def is_pattern(value):
     if isinstance(value, typing.Pattern):
         return True
-    wildcard_chars = {'*', '?', '$', '^'}
     try:
-        value_ = value
-        for char in wildcard_chars:
-            value_ = value_.replace(rf'\{char}', '')
-        return any(char in value_ for char in wildcard_chars)
-    except (TypeError, AttributeError):
+        return _WILDCARD_RE.search(value) is not None
+    except TypeError:
+        return False
+
+
+def _is_combinable_pattern(value) -> bool:
+    """Whether a string pattern can be OR-ed with others into a single regular expression."""
+    if not isinstance(value, str):
+        return False
+    try:
+        compiled = re.compile(value)
+    except re.error:
         return False
+    # Capturing groups would shift backreference numbers and inline flags would
+    # apply to the whole alternation, so keep such patterns separate.
+    return compiled.groups == 0 and compiled.flags == re.UNICODE
 
 
 def search(
@@ -42,18 +51,42 @@ def search(
         column_is_stringtype = isinstance(
             df[column].dtype, object | pd.core.arrays.string_.StringDtype
         )
+        # isin doesn't coerce values the way == does, e.g. strings on datetime columns,
+        # so it is only used on columns holding Python objects or strings
+        column_supports_isin = df[column].dtype == object or isinstance(
+            df[column].dtype, pd.StringDtype
+        )
         column_has_iterables = column in columns_with_iterables
+        literals = []
+        patterns = []
         for value in values:
             if column_has_iterables:
                 mask = df[column].str.contains(value, regex=False)
             elif column_is_stringtype and is_pattern(value):
+                if _is_combinable_pattern(value):
+                    patterns.append(value)
+                    continue
                 mask = df[column].str.contains(value, regex=True, case=True, flags=0)
             elif pd.isna(value):
                 mask = df[column].isnull()
+            elif column_supports_isin:
+                # Exact matches are collected and tested in a single hashed pass below
+                literals.append(value)
+                continue
             else:
                 mask = df[column] == value
             local_mask = local_mask | mask
+        if literals:
+            local_mask = local_mask | df[column].isin(literals)
+        if patterns:
+            combined = '|'.join(f'(?:{pattern})' for pattern in patterns)
+            local_mask = local_mask | df[column].str.contains(
+                combined, regex=True, case=True, flags=0
+            )
         global_mask = global_mask & local_mask
+        if not global_mask.any():
+            # No row can match anymore, the remaining columns need not be scanned
+            break
     results = df.loc[global_mask]
     return results.reset_index(drop=True)
 
@@ -75,25 +108,29 @@ def search_apply_require_all_on(
         _query.pop(column, None)
 
     keys = list(_query.keys())
-    grouped = df.groupby(require_all_on)
+    if not keys:
+        return df.reset_index(drop=True)
     values = [tuple(v) for v in _query.values()]
     condition = set(itertools.product(*values))
-    query_results = []
-    for _, group in grouped:
-        group_for_index = group
-        # Unpack iterables to get testable index.
-        for column in (columns_with_iterables or set()).intersection(keys):
-            group_for_index = unpack_iterable_column(group_for_index, column)
-
-        index = group_for_index.set_index(keys).index
-        if not isinstance(index, pd.MultiIndex):
-            index = {(element,) for element in index.to_list()}
-        else:
-            index = set(index.to_list())
-        if condition.issubset(index):  # with iterables we could have more then requested
-            query_results.append(group)
-
-    if query_results:
-        return pd.concat(query_results).reset_index(drop=True)
-
-    return pd.DataFrame(columns=df.columns)
+
+    # Unpack iterables once over the whole frame to get a testable index.
+    unpacked = df
+    for column in (columns_with_iterables or set()).intersection(keys):
+        unpacked = unpack_iterable_column(unpacked, column)
+
+    # Count the distinct requested combinations found in each group: a group is
+    # complete when it holds all of them (with iterables we could have more than requested).
+    matches = unpacked.loc[
+        pd.MultiIndex.from_frame(unpacked[keys]).isin(list(condition)), [*require_all_on, *keys]
+    ]
+    counts = matches.drop_duplicates().groupby(require_all_on).size()
+    complete = counts.index[counts == len(condition)]
+    if complete.empty:
+        return pd.DataFrame(columns=df.columns)
+
+    group_keys = pd.MultiIndex.from_frame(df[require_all_on])
+    if not isinstance(complete, pd.MultiIndex):
+        complete = pd.MultiIndex.from_arrays([complete])
+    results = df.loc[group_keys.isin(complete)]
+    # Keep the groupby ordering: sorted by group, original order within a group
+    return results.sort_values(require_all_on, kind='stable').reset_index(drop=True)
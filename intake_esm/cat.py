@@ -1,6 +1,5 @@
 import datetime
 import enum
-import functools
 import json
 import os
 import typing
@@ -14,26 +13,29 @@ from pydantic import ConfigDict
 from ._search import search, search_apply_require_all_on
 
 
-def _allnan_or_nonan(df, column: str) -> bool:
-    """Check if all values in a column are NaN or not NaN
+def _allnan_or_nonan(df, columns: list[str]) -> list[str]:
+    """Check if all values in each column are NaN or not NaN
 
     Returns
     -------
-    bool
-        Whether the dataframe column has all NaNs or no NaN valles
+    list of str
+        The columns that have no NaN values
 
     Raises
     ------
     ValueError
-        When the column has a mix of NaNs non NaN values
+        When a column has a mix of NaNs non NaN values
     """
-    if df[column].isnull().all():
-        return False
-    if df[column].isnull().any():
-        raise ValueError(
-            f'The data in the {column} column should either be all NaN or there should be no NaNs'
-        )
-    return True
+    # Build the NaN mask once for all columns instead of scanning each column twice
+    isnull = df[columns].isna().to_numpy()
+    allnan = isnull.all(axis=0)
+    anynan = isnull.any(axis=0)
+    for column, column_allnan, column_anynan in zip(columns, allnan, anynan):
+        if column_anynan and not column_allnan:
+            raise ValueError(
+                f'The data in the {column} column should either be all NaN or there should be no NaNs'
+            )
+    return [column for column, column_allnan in zip(columns, allnan) if not column_allnan]
 
 
 class AggregationType(str, enum.Enum):
@@ -109,6 +111,10 @@ class ESMCatalogModel(pydantic.BaseModel):
     title: pydantic.StrictStr | None = None
     last_updated: datetime.datetime | datetime.date | None = None
     _df: pd.DataFrame = pydantic.PrivateAttr()
+    # (dataframe, columns) pair so the sampling below is redone only when `_df` is replaced
+    _columns_with_iterables: tuple[pd.DataFrame, frozenset[str]] | None = pydantic.PrivateAttr(
+        default=None
+    )
 
     model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True)
 
@@ -262,12 +268,20 @@ class ESMCatalogModel(pydantic.BaseModel):
     @property
     def columns_with_iterables(self) -> set[str]:
         """Return a set of columns that have iterables."""
-        if self._df.empty:
-            return set()
-        has_iterables = (
-            self._df.sample(20, replace=True).map(type).isin([list, tuple, set]).any().to_dict()
-        )
-        return {column for column, check in has_iterables.items() if check}
+        if self._columns_with_iterables is None or self._columns_with_iterables[0] is not self._df:
+            if self._df.empty:
+                columns = frozenset()
+            else:
+                has_iterables = (
+                    self._df.sample(20, replace=True)
+                    .map(type)
+                    .isin([list, tuple, set])
+                    .any()
+                    .to_dict()
+                )
+                columns = frozenset(column for column, check in has_iterables.items() if check)
+            self._columns_with_iterables = (self._df, columns)
+        return set(self._columns_with_iterables[1])
 
     @property
     def df(self) -> pd.DataFrame:
@@ -288,12 +302,7 @@ class ESMCatalogModel(pydantic.BaseModel):
         if self.aggregation_control:
             if columns := list(
                 self.columns_with_iterables.intersection(
-                    set(
-                        map(
-                            lambda agg: agg.attribute_name,
-                            self.aggregation_control.aggregations,
-                        )
-                    )
+                    {agg.attribute_name for agg in self.aggregation_control.aggregations}
                 )
             ):
                 self._df[columns] = self._df[columns].apply(tuple)
@@ -302,33 +311,22 @@ class ESMCatalogModel(pydantic.BaseModel):
     def grouped(self) -> pd.core.groupby.DataFrameGroupBy | pd.DataFrame:
         if self.aggregation_control:
             if self.aggregation_control.groupby_attrs:
-                self.aggregation_control.groupby_attrs = list(
-                    filter(
-                        functools.partial(_allnan_or_nonan, self.df),
-                        self.aggregation_control.groupby_attrs,
-                    )
+                self.aggregation_control.groupby_attrs = _allnan_or_nonan(
+                    self.df, self.aggregation_control.groupby_attrs
                 )
 
             if self.aggregation_control.groupby_attrs and set(
                 self.aggregation_control.groupby_attrs
             ) != set(self.df.columns):
                 return self.df.groupby(self.aggregation_control.groupby_attrs)
-        cols = list(
-            filter(
-                functools.partial(_allnan_or_nonan, self.df),
-                self.df.columns,
-            )
-        )
+        cols = _allnan_or_nonan(self.df, list(self.df.columns))
         return self.df.groupby(cols)
 
     def _construct_group_keys(self, sep: str = '.') -> dict[str, str | tuple[str]]:
-        internal_keys = self.grouped.groups.keys()
-        public_keys = map(
-            lambda key: key if isinstance(key, str) else sep.join(str(value) for value in key),
-            internal_keys,
-        )
-
-        return dict(zip(public_keys, internal_keys))
+        return {
+            key if isinstance(key, str) else sep.join(str(value) for value in key): key
+            for key in self.grouped.groups.keys()
+        }
 
     def _unique(self) -> dict:
         def _find_unique(series):
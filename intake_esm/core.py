@@ -1,8 +1,8 @@
 import ast
 import concurrent.futures
+import copy
 import typing
 import warnings
-from copy import deepcopy
 
 import dask
 import packaging.version
@@ -137,6 +137,21 @@ class esm_datastore(Catalog):
                         f'Derived variable {key} depends on unknown column {col} in query: {entry.query}. Valid ESM catalog columns: {self.esmcat.df.columns.tolist()}.'
                     )
 
+    def _copy_with_groupby_attrs(self, groupby_attrs: list[str]) -> 'esm_datastore':
+        """Return a copy of the datastore grouping assets on `groupby_attrs`.
+
+        Only the aggregation control is copied: the catalog dataframe is shared
+        with the original datastore instead of being deep-copied.
+        """
+        aggregation_control = self.esmcat.aggregation_control.model_copy(
+            update={'groupby_attrs': groupby_attrs}
+        )
+        new = copy.copy(self)
+        new.esmcat = self.esmcat.model_copy(update={'aggregation_control': aggregation_control})
+        # Entries are keyed by group, so they can't be reused with different groups
+        new._entries = {}
+        return new
+
     def keys(self) -> list[str]:
         """
         Get keys for the catalog entries
@@ -246,8 +261,9 @@ class esm_datastore(Catalog):
         try:
             return self._entries[key]
         except KeyError as e:
-            if key in self.keys():
-                keys_dict = self.esmcat._construct_group_keys(sep=self.sep)
+            # Build the group keys once; keys() would construct them a second time
+            keys_dict = self.esmcat._construct_group_keys(sep=self.sep)
+            if key in keys_dict:
                 grouped = self.esmcat.grouped
 
                 internal_key = keys_dict[key]
@@ -660,8 +676,7 @@ class esm_datastore(Catalog):
         )
 
         if aggregate is not None and not aggregate and self.esmcat.aggregation_control:
-            self = deepcopy(self)
-            self.esmcat.aggregation_control.groupby_attrs = []
+            self = self._copy_with_groupby_attrs([])
         if progressbar is not None:
             self.progressbar = progressbar
         if self.progressbar:
@@ -770,8 +785,7 @@ class esm_datastore(Catalog):
 
         # Change the groupby controls if neccessary, used to assemble the tree
         if levels is not None:
-            self = deepcopy(self)
-            self.esmcat.aggregation_control.groupby_attrs = levels
+            self = self._copy_with_groupby_attrs(levels)
 
         # Set the separator to a / for datatree temporarily
         self.sep, old_sep = '/', self.sep
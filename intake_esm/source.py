@@ -1,3 +1,5 @@
+import collections
+import threading
 import typing
 import warnings
 
@@ -20,30 +22,100 @@ class ESMDataSourceError(Exception):
     pass
 
 
+# Lazily opened datasets, keyed by asset and open arguments, in least recently used order.
+# Only used when the ``cache_opened_datasets`` option is enabled.
+_OPEN_CACHE_SIZE = 128
+_open_cache: collections.OrderedDict[tuple, xr.Dataset] = collections.OrderedDict()
+_open_cache_lock = threading.Lock()
+
+
+def clear_open_cache():
+    """Close and release the datasets kept in memory by the ``cache_opened_datasets`` option."""
+    with _open_cache_lock:
+        datasets = list(_open_cache.values())
+        _open_cache.clear()
+    for ds in datasets:
+        ds.close()
+
+
+def _open_cache_key(urlpath, data_format, xarray_open_kwargs, storage_options):
+    # Arguments without a deterministic token, such as some custom decoders, would get a
+    # new key on every open and only fill the cache, so they are not cached at all.
+    try:
+        with dask.config.set({'tokenize.ensure-deterministic': True}):
+            token = dask.base.tokenize(xarray_open_kwargs, storage_options)
+    except RuntimeError:
+        return None
+    return (urlpath, data_format, token)
+
+
+def _cached_open(key, open_func):
+    with _open_cache_lock:
+        ds = _open_cache.get(key)
+        if ds is not None:
+            _open_cache.move_to_end(key)
+            # A shallow copy shares the lazy variables but not the attrs updated later
+            return ds.copy()
+
+    # Open outside the lock so that assets can still be opened concurrently
+    ds = open_func()
+    evicted = []
+    with _open_cache_lock:
+        if key in _open_cache:
+            # Another thread opened the same asset in the meantime
+            evicted.append(ds)
+            ds = _open_cache[key]
+            _open_cache.move_to_end(key)
+        else:
+            _open_cache[key] = ds
+            while len(_open_cache) > _OPEN_CACHE_SIZE:
+                evicted.append(_open_cache.popitem(last=False)[1])
+        ds = ds.copy()
+    for old in evicted:
+        old.close()
+    return ds
+
+
 def _get_xarray_open_kwargs(data_format, xarray_open_kwargs=None, storage_options=None):
-    xarray_open_kwargs = (xarray_open_kwargs or {}).copy()
-    _default_open_kwargs = {
+    xarray_open_kwargs = {
         'engine': 'zarr' if data_format in {'zarr', 'reference'} else 'netcdf4',
         'chunks': {},
         'backend_kwargs': {},
+        **(xarray_open_kwargs or {}),
     }
-    xarray_open_kwargs = (
-        {**_default_open_kwargs, **xarray_open_kwargs}
-        if xarray_open_kwargs
-        else _default_open_kwargs
-    )
 
-    if (
-        xarray_open_kwargs['engine'] == 'zarr'
-        and 'storage_options' not in xarray_open_kwargs['backend_kwargs']
-    ):
-        xarray_open_kwargs['backend_kwargs']['storage_options'] = {} or storage_options
+    if xarray_open_kwargs['engine'] == 'zarr' and storage_options:
+        # Copy so the caller's backend_kwargs are left untouched
+        xarray_open_kwargs['backend_kwargs'] = {
+            'storage_options': storage_options,
+            **xarray_open_kwargs['backend_kwargs'],
+        }
 
     return xarray_open_kwargs
 
 
-@dask.delayed
-def _open_dataset(
+def _open_url(urlpath, xarray_open_kwargs, *, data_format, storage_options, preprocess=None):
+    if xarray_open_kwargs['engine'] == 'zarr' or data_format == 'opendap':
+        url = urlpath
+    elif fsspec.utils.can_be_local(urlpath):
+        url = fsspec.open_local(urlpath, **storage_options)
+    else:
+        url = fsspec.open(urlpath, **storage_options).open()
+
+    # Handle multi-file datasets with `xr.open_mfdataset()`
+    if (isinstance(url, str) and '*' in url) or isinstance(url, list):
+        # How should we handle concat_dim, and other xr.open_mfdataset kwargs?
+        ds = xr.open_mfdataset(
+            url, **{**xarray_open_kwargs, 'preprocess': preprocess, 'parallel': True}
+        )
+    else:
+        ds = xr.open_dataset(url, **xarray_open_kwargs)
+        if preprocess is not None:
+            ds = preprocess(ds)
+    return ds
+
+
+def _open_dataset_sync(
     urlpath,
     varname,
     *,
@@ -59,29 +131,44 @@ def _open_dataset(
         'storage_options', {}
     )
 
-    # Support kerchunk datasets, setting the file object (fo) and urlpath
+    # Support kerchunk datasets, setting the file object (fo) and urlpath.
+    # The open kwargs may be shared between assets, so copy rather than mutate them.
     if data_format == 'reference':
-        xarray_open_kwargs['backend_kwargs']['storage_options']['fo'] = urlpath
-        xarray_open_kwargs['backend_kwargs']['consolidated'] = False
+        backend_kwargs = xarray_open_kwargs['backend_kwargs']
+        xarray_open_kwargs = {
+            **xarray_open_kwargs,
+            'backend_kwargs': {
+                **backend_kwargs,
+                'storage_options': {**(backend_kwargs.get('storage_options') or {}), 'fo': urlpath},
+                'consolidated': False,
+            },
+        }
         urlpath = 'reference://'
 
-    if xarray_open_kwargs['engine'] in 'zarr' or data_format == 'opendap':
-        url = urlpath
-    elif fsspec.utils.can_be_local(urlpath):
-        url = fsspec.open_local(urlpath, **storage_options)
-    else:
-        url = fsspec.open(urlpath, **storage_options).open()
-
-    # Handle multi-file datasets with `xr.open_mfdataset()`
-    if (isinstance(url, str) and '*' in url) or isinstance(url, list):
-        # How should we handle concat_dim, and other xr.open_mfdataset kwargs?
-        xarray_open_kwargs.update(preprocess=preprocess)
-        xarray_open_kwargs.update(parallel=True)
-        ds = xr.open_mfdataset(url, **xarray_open_kwargs)
-    else:
-        ds = xr.open_dataset(url, **xarray_open_kwargs)
+    cache_key = None
+    # Glob paths are combined by xr.open_mfdataset, which applies preprocess per file
+    if OPTIONS['cache_opened_datasets'] and '*' not in urlpath:
+        cache_key = _open_cache_key(urlpath, data_format, xarray_open_kwargs, storage_options)
+    if cache_key is not None:
+        ds = _cached_open(
+            cache_key,
+            lambda: _open_url(
+                urlpath,
+                xarray_open_kwargs,
+                data_format=data_format,
+                storage_options=storage_options,
+            ),
+        )
         if preprocess is not None:
             ds = preprocess(ds)
+    else:
+        ds = _open_url(
+            urlpath,
+            xarray_open_kwargs,
+            data_format=data_format,
+            storage_options=storage_options,
+            preprocess=preprocess,
+        )
 
     if varname and isinstance(varname, str):
         varname = [varname]
@@ -90,14 +177,15 @@ def _open_dataset(
         if isinstance(requested_variables, str):
             requested_variables = [requested_variables]
 
-        variable_intersection = set(requested_variables).intersection(set(varname))
+        variable_intersection = set(requested_variables).intersection(varname)
 
-        data_vars = variable_intersection & set(ds.data_vars)
-        coord_vars = variable_intersection & set(ds.coords)
+        data_vars = variable_intersection & ds.data_vars.keys()
+        coord_vars = variable_intersection & ds.coords.keys()
 
         variables = list(data_vars | coord_vars)
 
-        scalar_variables = [v for v in ds.data_vars if len(ds[v].dims) == 0]
+        # Inspect the underlying variables rather than building a DataArray per name
+        scalar_variables = [v for v in ds.data_vars if ds.variables[v].ndim == 0]
 
         ds = ds.set_coords(scalar_variables)
         ds = ds[variables]
@@ -110,23 +198,33 @@ def _open_dataset(
     return ds
 
 
+_open_dataset = dask.delayed(_open_dataset_sync)
+
+
 def _update_attrs(*, additional_attrs, ds):
-    additional_attrs = additional_attrs or {}
     if additional_attrs:
-        additional_attrs = {
-            f"{OPTIONS['attrs_prefix']}:{key}": f'{value}'
-            if isinstance(value, str) or not hasattr(value, '__iter__')
-            else ','.join(value)
-            for key, value in additional_attrs.items()
-        }
-    ds.attrs = {**ds.attrs, **additional_attrs}
+        # The dataset was opened by us, so its attrs can be updated in place
+        # instead of rebuilding a merged dict for every asset.
+        ds.attrs.update(
+            {
+                f"{OPTIONS['attrs_prefix']}:{key}": f'{value}'
+                if isinstance(value, str) or not hasattr(value, '__iter__')
+                else ','.join(value)
+                for key, value in additional_attrs.items()
+            }
+        )
     return ds
 
 
 def _expand_dims(expand_dims, ds):
     if expand_dims:
-        for variable in ds.attrs[OPTIONS['vars_key']]:
-            ds[variable] = ds[variable].expand_dims(**expand_dims)
+        # Assign all expanded variables at once rather than updating the dataset per variable
+        ds = ds.assign(
+            {
+                variable: ds[variable].expand_dims(**expand_dims)
+                for variable in ds.attrs[OPTIONS['vars_key']]
+            }
+        )
 
     return ds
 
@@ -196,6 +294,11 @@ class ESMDataSource(DataSource):
         self.path_column_name = path_column_name
         self.variable_column_name = variable_column_name
         self.aggregations = aggregations
+        # Aggregations are fixed for the lifetime of the source
+        self._join_new_attrs = tuple(
+            agg.attribute_name for agg in aggregations or [] if agg.type.value == 'join_new'
+        )
+        self._aggregation_attrs = tuple(agg.attribute_name for agg in aggregations or [])
         self.df = pd.DataFrame.from_records(records)
         self.xarray_open_kwargs = xarray_open_kwargs
         self.xarray_combine_by_coords_kwargs = dict(combine_attrs='drop_conflicts')
@@ -216,56 +319,91 @@ class ESMDataSource(DataSource):
         return f'<{type(self).__name__}  (name: {self.key}, asset(s): {len(self.df)})>'
 
     def _get_schema(self) -> Schema:
+        if self._schema is not None:
+            return self._schema
         if self._ds is None:
             self._open_dataset()
-            metadata: dict[str, typing.Any] = {'dims': {}, 'data_vars': {}, 'coords': ()}
-            self._schema = Schema(
-                datashape=None,
-                dtype=None,
-                shape=None,
-                npartitions=None,
-                extra_metadata=metadata,
-            )
+        metadata: dict[str, typing.Any] = {
+            'dims': dict(self._ds.sizes),
+            'data_vars': {name: list(var.coords) for name, var in self._ds.data_vars.items()},
+            'coords': tuple(self._ds.coords),
+        }
+        self._schema = Schema(
+            datashape=None,
+            dtype=None,
+            shape=None,
+            npartitions=None,
+            extra_metadata=metadata,
+        )
         return self._schema
 
     def _open_dataset(self):
         """Open dataset with xarray"""
 
         try:
+            # Plain dicts avoid building a Series per row; the NaN mask is computed once
+            records = self.df.to_dict(orient='records')
+            notnull = self.df.notna().to_numpy()
+            columns = self.df.columns
+            # There are typically only one or two formats per source
+            open_kwargs = {
+                data_format: _get_xarray_open_kwargs(
+                    data_format, self.xarray_open_kwargs, self.storage_options
+                )
+                for data_format in self.df['_data_format_'].unique()
+            }
+            preprocess = self.preprocess
+            if len(records) == 1:
+                # A single asset gains nothing from going through the dask scheduler
+                open_func = _open_dataset_sync
+            else:
+                # Arguments shared by every asset are wrapped in delayed objects so they
+                # are stored once in the task graph instead of being serialized with each task.
+                open_func = _open_dataset
+                open_kwargs = {
+                    data_format: dask.delayed(kwargs, pure=True)
+                    for data_format, kwargs in open_kwargs.items()
+                }
+                if preprocess is not None:
+                    preprocess = dask.delayed(preprocess, pure=True)
             datasets = [
-                _open_dataset(
+                open_func(
                     record[self.path_column_name],
                     record[self.variable_column_name] if self.variable_column_name else None,
-                    xarray_open_kwargs=_get_xarray_open_kwargs(
-                        record['_data_format_'], self.xarray_open_kwargs, self.storage_options
-                    ),
-                    preprocess=self.preprocess,
-                    expand_dims={
-                        agg.attribute_name: [record[agg.attribute_name]]
-                        for agg in self.aggregations
-                        if agg.type.value == 'join_new'
-                    },
+                    xarray_open_kwargs=open_kwargs[record['_data_format_']],
+                    preprocess=preprocess,
+                    expand_dims={name: [record[name]] for name in self._join_new_attrs}
+                    if self._join_new_attrs
+                    else None,
                     requested_variables=self.requested_variables,
                     data_format=record['_data_format_'],
-                    additional_attrs=record[~record.isnull()].to_dict(),
+                    additional_attrs={
+                        column: value
+                        for column, value, keep in zip(columns, record.values(), row_notnull)
+                        if keep
+                    },
                     storage_options=self.storage_options,
                 )
-                for _, record in self.df.iterrows()
+                for record, row_notnull in zip(records, notnull)
             ]
 
-            datasets = dask.compute(*datasets)
+            if len(datasets) > 1:
+                datasets = dask.compute(*datasets)
             if len(datasets) == 1 or not datasets[0].data_vars:
                 self._ds = datasets[0]
             else:
+                # Order the datasets by the values of their aggregation attributes,
+                # as set by _update_attrs with the prefix in effect at open time
+                sort_keys = [
+                    f"{OPTIONS['attrs_prefix']}:{name}" for name in self._aggregation_attrs
+                ]
                 datasets = sorted(
-                    datasets,
-                    key=lambda ds: tuple(
-                        f"{OPTIONS['attrs_prefix']}/{agg.attribute_name}"
-                        for agg in self.aggregations
-                    ),
+                    datasets, key=lambda ds: tuple(ds.attrs.get(key, '') for key in sort_keys)
                 )
+                # Only data variables can be demoted; variables that are already
+                # coordinates don't need to go through set_coords again.
                 datasets = [
-                    ds.set_coords(set(ds.variables) - set(ds.attrs[OPTIONS['vars_key']]))
+                    ds.set_coords(ds.data_vars.keys() - set(ds.attrs[OPTIONS['vars_key']]))
                     for ds in datasets
                 ]
                 try:
@@ -12,6 +12,11 @@ DEFAULT_CATALOGS = {
     'google_cmip6': 'https://raw.githubusercontent.com/intake/intake-esm/main/tutorial-catalogs/GOOGLE-CMIP6.json',
 }
 
+_UNKNOWN_KEY_MESSAGE = (
+    'KeyError: {name} is an unknown key. Only small-catalogs in our `tutorial-catalogs` '
+    f'directory are supported with this method. Valid values include: {list(DEFAULT_CATALOGS)} .'
+)
+
 
 def get_url(name: str) -> str:
     """
@@ -34,13 +39,11 @@ def get_url(name: str) -> str:
         URL of the catalog.
     """
 
-    if name in DEFAULT_CATALOGS:
-        return DEFAULT_CATALOGS[name]
+    url = DEFAULT_CATALOGS.get(name)
+    if url is not None:
+        return url
 
-    raise KeyError(
-        f'KeyError: {name} is an unknown key. Only small-catalogs in our `tutorial-catalogs`'
-        f'directory are supported with this method. Valid values include: {get_available_cats()} .'
-    )
+    raise KeyError(_UNKNOWN_KEY_MESSAGE.format(name=name))
 
 
 def get_available_cats() -> list[str]:
@@ -1,8 +1,25 @@
 """Helper functions for fetching and loading catalog"""
 
-import importlib
+import importlib.metadata
 import sys
 
+# Kept in alphabetical order, which is the order they are reported in
+_DEPS = (
+    'cftime',
+    'dask',
+    'fastprogress',
+    'fsspec',
+    'gcsfs',
+    'intake',
+    'intake_esm',
+    'netCDF4',
+    'pandas',
+    'requests',
+    's3fs',
+    'xarray',
+    'zarr',
+)
+
 
 def show_versions(file=sys.stdout):  # pragma: no cover
     """print the versions of intake-esm and its dependencies.
@@ -14,43 +31,24 @@ def show_versions(file=sys.stdout):  # pragma: no cover
         print to the given file-like object. Defaults to sys.stdout.
     """
 
-    deps = [
-        ('xarray', lambda mod: mod.__version__),
-        ('pandas', lambda mod: mod.__version__),
-        ('intake', lambda mod: mod.__version__),
-        ('intake_esm', lambda mod: mod.__version__),
-        ('fsspec', lambda mod: mod.__version__),
-        ('s3fs', lambda mod: mod.__version__),
-        ('gcsfs', lambda mod: mod.__version__),
-        ('fastprogress', lambda mod: mod.__version__),
-        ('dask', lambda mod: mod.__version__),
-        ('zarr', lambda mod: mod.__version__),
-        ('cftime', lambda mod: mod.__version__),
-        ('netCDF4', lambda mod: mod.__version__),
-        ('requests', lambda mod: mod.__version__),
-    ]
-
     deps_blob = []
-    for modname, ver_f in deps:
+    for modname in _DEPS:
+        # Read the version from already imported modules or from the installed
+        # package metadata, so that reporting versions doesn't import anything.
+        mod = sys.modules.get(modname)
+        if mod is not None:
+            deps_blob.append((modname, getattr(mod, '__version__', 'installed')))
+            continue
         try:
-            if modname in sys.modules:
-                mod = sys.modules[modname]
-            else:
-                mod = importlib.import_module(modname)
-        except Exception:
+            deps_blob.append((modname, importlib.metadata.version(modname)))
+        except importlib.metadata.PackageNotFoundError:
             deps_blob.append((modname, None))
-        else:
-            try:
-                ver = ver_f(mod)
-                deps_blob.append((modname, ver))
-            except Exception:
-                deps_blob.append((modname, 'installed'))
 
     print('\nINSTALLED VERSIONS', file=file)
     print('------------------', file=file)
 
     print('', file=file)
-    for k, stat in sorted(deps_blob):
+    for k, stat in deps_blob:
         print(f'{k}: {stat}', file=file)
 
 
@@ -58,6 +56,7 @@ OPTIONS = {
     'attrs_prefix': 'intake_esm_attrs',
     'dataset_key': 'intake_esm_dataset_key',
     'vars_key': 'intake_esm_vars',
+    'cache_opened_datasets': False,
 }
 
 
@@ -76,6 +75,12 @@ class set_options:
     - ``vars_key``:
       Name of the global attribute where to store the list of requested variables when
       opening a dataset. Default: ``intake_esm_vars``.
+    - ``cache_opened_datasets``:
+      Whether to keep the lazily opened datasets of the 128 most recently used assets in
+      memory and reuse them when the same asset is opened again. Use
+      :py:func:`~intake_esm.source.clear_open_cache` to close and release the cached
+      datasets. Assets opened with arguments that dask cannot tokenize deterministically
+      are never cached. Default: ``False``.
 
     Examples
     --------
@@ -93,29 +98,23 @@ class set_options:
     """
 
     def __init__(self, **kwargs):
-        self.old = {}
         for k, v in kwargs.items():
             if k not in OPTIONS:
                 raise ValueError(
                     f'argument name {k} is not in the set of valid options {set(OPTIONS)}'
                 )
 
-            if not isinstance(v, str):
+            if not isinstance(v, type(OPTIONS[k])):
                 raise ValueError(f'option {k} given an invalid value: {v}')
 
-            self.old[k] = OPTIONS[k]
-
-        self._update(kwargs)
+        # Validate everything before applying, so a bad value leaves OPTIONS untouched
+        self.old = {k: OPTIONS[k] for k in kwargs}
+        OPTIONS.update(kwargs)
 
     def __enter__(self):
         """Context management."""
         return
 
-    def _update(self, kwargs):
-        """Update values."""
-        for k, v in kwargs.items():
-            OPTIONS[k] = v
-
     def __exit__(self, type, value, traceback):
         """Context management."""
-        self._update(self.old)
+        OPTIONS.update(self.old)
@@ -2,7 +2,7 @@ import pandas as pd
 import pydantic
 import pytest
 
-from intake_esm.cat import Assets, ESMCatalogModel, QueryModel
+from intake_esm.cat import Assets, ESMCatalogModel, QueryModel, _allnan_or_nonan
 
 from .utils import (
     catalog_dict_records,
@@ -68,6 +68,24 @@ def test_esmcatmodel_from_dict(esmcat_data):
     assert isinstance(cat.columns_with_iterables, set)
 
 
+def test_esmcatmodel_columns_with_iterables_cache():
+    cat = ESMCatalogModel.from_dict({'esmcat': sample_esmcat_data, 'df': sample_df})
+    assert cat.columns_with_iterables == set()
+
+    # Replacing the dataframe must invalidate the cached result
+    df = sample_df.copy()
+    df['variable'] = df['variable'].map(lambda value: [value])
+    cat._df = df
+    assert cat.columns_with_iterables == {'variable'}
+
+
+def test_allnan_or_nonan():
+    df = pd.DataFrame({'A': ['a', 'b'], 'B': [None, None], 'C': ['c', None]})
+    assert _allnan_or_nonan(df, ['A', 'B']) == ['A']
+    with pytest.raises(ValueError, match='The data in the C column'):
+        _allnan_or_nonan(df, ['A', 'B', 'C'])
+
+
 @pytest.mark.parametrize(
     'query, expected_unique_vals, expected_nunique_vals',
     [
@@ -244,7 +244,11 @@ def test_catalog_keys_info(cat):
         ('dict', {}, {}, None),
     ],
 )
-def test_catalog_serialize(catalog_type, to_csv_kwargs, json_dump_kwargs, directory):
+def test_catalog_serialize(
+    tmp_path, monkeypatch, catalog_type, to_csv_kwargs, json_dump_kwargs, directory
+):
+    # Relative and default directories resolve to the working directory
+    monkeypatch.chdir(tmp_path)
     cat = intake.open_esm_datastore(cdf_cat_sample_cmip6)
     cat_subset = cat.search(
         source_id='MRI-ESM2-0',
@@ -291,9 +295,12 @@ def test_getitem(key, decode_times):
     cat = intake.open_esm_datastore(cdf_cat_sample_cmip6)
     x = cat[key]
     assert isinstance(x, intake_esm.source.ESMDataSource)
-    ds = x(xarray_open_kwargs={'chunks': {}, 'decode_times': decode_times}).to_dask()
+    source = x(xarray_open_kwargs={'chunks': {}, 'decode_times': decode_times})
+    ds = source.to_dask()
     assert isinstance(ds, xr.Dataset)
     assert set(x.df['member_id']) == set(ds['member_id'].values)
+    assert source.metadata['dims'] == dict(ds.sizes)
+    assert set(source.metadata['data_vars']) == set(ds.data_vars)
 
 
 @pytest.mark.parametrize(
@@ -468,8 +475,11 @@ def test_to_dataset_dict_aggfalse(path, query):
     cat = intake.open_esm_datastore(path)
     cat_sub = cat.search(**query)
     nds = len(cat_sub.df)
+    nkeys = len(cat_sub.keys())
     dsets = cat_sub.to_dataset_dict(xarray_open_kwargs={'chunks': {'time': 1}}, aggregate=False)
     assert len(dsets.keys()) == nds
+    # The original catalog keeps its grouping
+    assert len(cat_sub.keys()) == nkeys
 
 
 @pytest.mark.parametrize(
@@ -584,3 +594,8 @@ def test_options():
             xarray_open_kwargs={'backend_kwargs': {'storage_options': {'anon': True}}},
         ).popitem()
         assert ds.attrs['myprefix:component'] == 'atm'
+
+
+def test_set_options_invalid_value():
+    with pytest.raises(ValueError):
+        intake_esm.set_options(cache_opened_datasets='yes')
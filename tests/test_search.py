@@ -12,6 +12,7 @@ from intake_esm.cat import QueryModel
     'value, expected',
     [
         (2, False),
+        (None, False),
         ('foo', False),
         ('foo\\**bar', True),
         ('foo\\?*bar', True),
@@ -101,6 +102,15 @@ params = [
             {'A': 'NCAR', 'B': 'CESM', 'C': 'control', 'D': 'O2'},
         ],
     ),
+    (
+        {'D': ['^N.*', 'A$']},
+        None,
+        [
+            {'A': 'IPSL', 'B': 'FOO', 'C': 'hist', 'D': 'NO2'},
+            {'A': 'NCAR', 'B': 'WACM', 'C': 'hist', 'D': 'TA'},
+            {'A': None, 'B': None, 'C': 'exp', 'D': 'UA'},
+        ],
+    ),
     (
         {'C': ['hist'], 'D': ['TA']},
         None,
@@ -224,3 +234,16 @@ def test_search_require_all_on_columns_with_iterables(query, expected):
         columns_with_iterables={'variable', 'random'},
     ).to_dict(orient='records')
     assert results == expected
+
+
+@pytest.mark.parametrize('value', ['2000-01-01', [pd.Timestamp('2000-01-01')]])
+def test_search_datetime_column(value):
+    df = pd.DataFrame(
+        {
+            'path': ['file1', 'file2'],
+            'time': pd.to_datetime(['2000-01-01', '2000-02-01']),
+        }
+    )
+    query_model = QueryModel(query={'time': value}, columns=df.columns.tolist())
+    results = search(df=df, query=query_model.query, columns_with_iterables=set())
+    assert results.path.tolist() == ['file1']
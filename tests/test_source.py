@@ -6,7 +6,17 @@ import dask
 import pytest
 import xarray
 
-from intake_esm.source import _get_xarray_open_kwargs, _open_dataset, _update_attrs
+import intake_esm
+from intake_esm.cat import Aggregation
+from intake_esm.source import (
+    ESMDataSource,
+    _get_xarray_open_kwargs,
+    _open_cache,
+    _open_cache_key,
+    _open_dataset,
+    _open_dataset_sync,
+    _update_attrs,
+)
 
 dask.config.set(scheduler='single-threaded')
 
@@ -66,10 +76,91 @@ def test_open_dataset(fpath, expected_time_size, engine):
     assert len(ds.time) == expected_time_size
 
 
-@pytest.mark.parametrize('storage_options', [{'anon': True}, {}])
-def test_get_xarray_open_kwargs(storage_options):
+def test_open_dataset_does_not_mutate_open_kwargs():
+    xarray_open_kwargs = _get_xarray_open_kwargs('netcdf')
+    expected = {**xarray_open_kwargs}
+    ds = _open_dataset(multi_path, 'tasmax', xarray_open_kwargs=xarray_open_kwargs).compute()
+    assert isinstance(ds, xarray.Dataset)
+    assert xarray_open_kwargs == expected
+
+
+def test_open_dataset_sync():
+    xarray_open_kwargs = _get_xarray_open_kwargs('netcdf')
+    ds = _open_dataset_sync(f1, 'tasmax', xarray_open_kwargs=xarray_open_kwargs)
+    assert isinstance(ds, xarray.Dataset)
+    assert ds.identical(_common_open(f1))
+
+
+@pytest.fixture
+def open_cache():
+    try:
+        with intake_esm.set_options(cache_opened_datasets=True):
+            yield _open_cache
+    finally:
+        intake_esm.clear_open_cache()
+
+
+def test_open_dataset_cache(open_cache):
+    xarray_open_kwargs = _get_xarray_open_kwargs('netcdf')
+    ds1 = _open_dataset_sync(
+        f1, 'tasmax', xarray_open_kwargs=xarray_open_kwargs, additional_attrs={'a': 1}
+    )
+    ds2 = _open_dataset_sync(f1, 'tasmax', xarray_open_kwargs=xarray_open_kwargs)
+    assert len(open_cache) == 1
+    assert ds1.tasmax.data.name == ds2.tasmax.data.name
+    assert 'intake_esm_attrs:a' not in ds2.attrs
+    intake_esm.clear_open_cache()
+    assert not open_cache
+
+
+def test_open_dataset_cache_eviction(open_cache, monkeypatch):
+    monkeypatch.setattr(intake_esm.source, '_OPEN_CACHE_SIZE', 1)
+    xarray_open_kwargs = _get_xarray_open_kwargs('netcdf')
+    _open_dataset_sync(f1, 'tasmax', xarray_open_kwargs=xarray_open_kwargs)
+    ds = _open_dataset_sync(f2, 'tasmax', xarray_open_kwargs=xarray_open_kwargs)
+    assert [key[0] for key in open_cache] == [f2]
+    assert ds.identical(_common_open(f2))
+
+
+def test_open_dataset_cache_skips_nondeterministic_kwargs(open_cache):
+    class Decoder:
+        # Not picklable, so dask cannot give it a stable token
+        def __reduce__(self):
+            raise TypeError('not picklable')
+
+    xarray_open_kwargs = {**_get_xarray_open_kwargs('netcdf'), 'decoder': Decoder()}
+    assert _open_cache_key(f1, 'netcdf', xarray_open_kwargs, None) is None
+    assert _open_cache_key(f1, 'netcdf', _get_xarray_open_kwargs('netcdf'), None) is not None
+
+
+@pytest.mark.parametrize(
+    'storage_options, expected', [({'anon': True}, {'anon': True}), ({}, None), (None, None)]
+)
+def test_get_xarray_open_kwargs(storage_options, expected):
     xarray_open_kwargs = _get_xarray_open_kwargs('zarr', storage_options=storage_options)
-    assert xarray_open_kwargs['backend_kwargs']['storage_options'] == storage_options
+    assert xarray_open_kwargs['backend_kwargs'].get('storage_options') == expected
+
+
+def test_get_xarray_open_kwargs_without_storage_options():
+    backend_kwargs = {'consolidated': True}
+    xarray_open_kwargs = _get_xarray_open_kwargs('zarr', {'backend_kwargs': backend_kwargs})
+    assert xarray_open_kwargs['backend_kwargs'] == {'consolidated': True}
+    xarray_open_kwargs = _get_xarray_open_kwargs(
+        'zarr', {'backend_kwargs': backend_kwargs}, storage_options={'anon': True}
+    )
+    assert xarray_open_kwargs['backend_kwargs'] == {
+        'storage_options': {'anon': True},
+        'consolidated': True,
+    }
+    assert backend_kwargs == {'consolidated': True}
+
+
+def test_open_dataset_engine_none():
+    # engine=None lets xarray pick the backend
+    xarray_open_kwargs = _get_xarray_open_kwargs('netcdf', {'engine': None})
+    assert xarray_open_kwargs['engine'] is None
+    ds = _open_dataset(f1, 'tasmax', xarray_open_kwargs=xarray_open_kwargs).compute()
+    assert isinstance(ds, xarray.Dataset)
 
 
 def test_open_dataset_kerchunk(kerchunk_file=kerchunk_file):
@@ -104,6 +195,61 @@ def test_update_attrs(tmp_path, data_format, attrs):
     assert ds_new.attrs == ds.attrs
 
 
+@pytest.mark.parametrize(
+    'records,expected_sizes',
+    [
+        (
+            [
+                {'path': f1, 'member_id': 'r2', 'variable_id': 'tasmax'},
+                {'path': f1, 'member_id': 'r1', 'variable_id': 'tasmax'},
+            ],
+            {'member_id': 2, 'time': 2},
+        ),
+        (
+            [
+                {'path': f1, 'member_id': 'r1', 'variable_id': 'tasmax'},
+                {'path': f2, 'member_id': 'r1', 'variable_id': 'tasmax'},
+                {'path': f1, 'member_id': 'r2', 'variable_id': 'tasmax'},
+                {'path': f2, 'member_id': 'r2', 'variable_id': 'tasmax'},
+            ],
+            {'member_id': 2, 'time': 4},
+        ),
+    ],
+)
+def test_join_new_only(records, expected_sizes):
+    source = ESMDataSource(
+        key='foo',
+        records=records,
+        path_column_name='path',
+        data_format='netcdf',
+        format_column_name=None,
+        variable_column_name='variable_id',
+        aggregations=[Aggregation(type='join_new', attribute_name='member_id')],
+    )
+    ds = source.to_dask()
+    assert {dim: ds.sizes[dim] for dim in expected_sizes} == expected_sizes
+    assert ds.member_id.values.tolist() == ['r1', 'r2']
+
+
+def test_open_local_zarr_source(tmp_path):
+    records = []
+    for member_id in ['r1', 'r2']:
+        path = str(tmp_path / f'{member_id}.zarr')
+        _common_open(f1).to_zarr(path)
+        records.append({'path': path, 'member_id': member_id, 'variable_id': 'tasmax'})
+    source = ESMDataSource(
+        key='foo',
+        records=records,
+        path_column_name='path',
+        data_format='zarr',
+        format_column_name=None,
+        variable_column_name='variable_id',
+        aggregations=[Aggregation(type='join_new', attribute_name='member_id')],
+    )
+    ds = source.to_dask()
+    assert ds.sizes['member_id'] == 2
+
+
 @pytest.mark.parametrize(
     'fpath,dvars,cvars,expected',
     [